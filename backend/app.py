@@ -23,6 +23,16 @@ def create_app():
         app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-secret-key')
+    app.config['FORECAST_METHOD'] = os.environ.get('FORECAST_METHOD', 'ema')  # ema or sma
+    app.config['FORECAST_HISTORY_DAYS'] = int(os.environ.get('FORECAST_HISTORY_DAYS', 365))
+    app.config['FORECAST_LEAD_TIME_DAYS'] = int(os.environ.get('FORECAST_LEAD_TIME_DAYS', 7))
+    app.config['ARCHIVE_HORIZON_DAYS'] = int(os.environ.get('ARCHIVE_HORIZON_DAYS', 365))
+    app.config['ARCHIVE_BATCH_SIZE'] = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+    app.config['INVOICE_TERMS_DAYS'] = int(os.environ.get('INVOICE_TERMS_DAYS', 30))
+    app.config['NOTIFY_SENDER'] = os.environ.get('NOTIFY_SENDER', 'console')  # console, file or module:Class
+    app.config['NOTIFY_FILE'] = os.environ.get('NOTIFY_FILE', 'notifications.log')
+    app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    app.config['SYNC_SETTLE_SECONDS'] = int(os.environ.get('SYNC_SETTLE_SECONDS', 2))
 
     db.init_app(app)
     jwt.init_app(app)
@@ -30,13 +40,20 @@ def create_app():
     api = Api(app)
     migrate = Migrate(app, db)
 
+    from utils.compression import init_compression
+    from utils.representations import register_representations
+    init_compression(app, app.config['COMPRESS_MIN_SIZE'])
+    register_representations(api)
+
     from resources.auth import LoginResource, LogoutResource, SignupResource, ForgotPasswordResource, ResetPasswordResource
-    from resources.stock import StockResource
-    from resources.order import OrderResource
+    from resources.stock import StockResource, StockMovementResource, StockLevelResource, StockReorderResource
+    from resources.order import OrderResource, OrderTransitionResource, OrderViewResource
     from resources.invoice import InvoiceResource
     from resources.payment import PaymentResource, PaymentUploadResource
     from resources.receipt import ReceiptResource
     from resources.delivery_note import DeliveryNoteResource
+    from resources.export import ExportResource
+    from resources.sync import SyncResource
 
     api.add_resource(LoginResource, '/auth/login')
     api.add_resource(LogoutResource, '/auth/logout')
@@ -44,18 +61,30 @@ def create_app():
     api.add_resource(ForgotPasswordResource, '/auth/forgot-password')
     api.add_resource(ResetPasswordResource, '/auth/reset-password')
     api.add_resource(StockResource, '/stock', '/stock/<int:id>')
+    api.add_resource(StockMovementResource, '/stock/<int:id>/movements')
+    api.add_resource(StockLevelResource, '/stock/<int:id>/level')
+    api.add_resource(StockReorderResource, '/stock/reorder')
     api.add_resource(OrderResource, '/orders', '/orders/<int:id>')
+    api.add_resource(OrderTransitionResource, '/orders/transition')
+    api.add_resource(OrderViewResource, '/orders/<int:id>/view')
     api.add_resource(InvoiceResource, '/invoices', '/invoices/<int:id>')
     api.add_resource(PaymentResource, '/api/payments', '/api/payments/<int:id>')
     api.add_resource(PaymentUploadResource, '/api/payments/upload')
     api.add_resource(ReceiptResource, '/receipts', '/receipts/<int:id>')
     api.add_resource(DeliveryNoteResource, '/delivery-notes', '/delivery-notes/<int:id>')
+    api.add_resource(ExportResource, '/exports/<string:doc_type>')
+    api.add_resource(SyncResource, '/sync/<string:resource>')
+
+    from scheduler import JOBS, run_job
+    for name in JOBS:
+        # flask <job-name> runs a scheduler job once
+        app.cli.command(name)(lambda name=name: run_job(app, name))
 
     return app
 
 if __name__ == "__main__":
     app = create_app()
     with app.app_context():
-        from models import User, Stock, Order, Invoice, Payment, Receipt, DeliveryNote
+        from models import User, Stock, StockMovement, StockSnapshot, StockForecast, Order, Invoice, Payment, Receipt, DeliveryNote
         db.create_all()
     app.run(debug=True)
\ No newline at end of file
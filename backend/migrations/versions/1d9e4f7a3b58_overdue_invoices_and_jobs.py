@@ -0,0 +1,71 @@
+"""Overdue invoice tracking, job state and notification outbox
+
+Revision ID: 1d9e4f7a3b58
+Revises: e5a81b3c6d27
+Create Date: 2026-10-19 14:48:32.270558
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d9e4f7a3b58'
+down_revision = 'e5a81b3c6d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('watermark', sa.DateTime(), nullable=True),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('notification',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notification_sent_at'), 'notification', ['sent_at'], unique=False)
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('due_date', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('is_overdue', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    with op.batch_alter_table('invoice_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('due_date', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('is_overdue', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_payment_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('payment_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute('UPDATE payment SET updated_at = paid_at')
+
+
+def downgrade():
+    with op.batch_alter_table('payment_archive', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payment_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('invoice_archive', schema=None) as batch_op:
+        batch_op.drop_column('is_overdue')
+        batch_op.drop_column('due_date')
+
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_column('is_overdue')
+        batch_op.drop_column('due_date')
+
+    op.drop_index(op.f('ix_notification_sent_at'), table_name='notification')
+    op.drop_table('notification')
+    op.drop_table('job_state')
@@ -0,0 +1,52 @@
+"""Stock movement ledger and snapshots
+
+Revision ID: 3f2a9c1d7b40
+Revises: db7dc0a56444
+Create Date: 2026-10-19 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b40'
+down_revision = 'db7dc0a56444'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_movement',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('reference', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stock.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_movement_stock_id_created_at', 'stock_movement', ['stock_id', 'created_at'], unique=False)
+    op.create_table('stock_snapshot',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('movement_id', sa.Integer(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stock.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_snapshot_stock_id_taken_at', 'stock_snapshot', ['stock_id', 'taken_at'], unique=False)
+    # Existing quantities become the opening snapshot of the ledger
+    op.execute(
+        'INSERT INTO stock_snapshot (stock_id, quantity, movement_id, taken_at) '
+        'SELECT id, quantity, 0, CURRENT_TIMESTAMP FROM stock'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_stock_snapshot_stock_id_taken_at', table_name='stock_snapshot')
+    op.drop_table('stock_snapshot')
+    op.drop_index('ix_stock_movement_stock_id_created_at', table_name='stock_movement')
+    op.drop_table('stock_movement')
@@ -0,0 +1,52 @@
+"""Track reserved stock separately; cut snapshots by time
+
+Revision ID: 4b8d2a6e0c15
+Revises: 9e0b7c4d1a86
+Create Date: 2026-10-20 09:31:02.664180
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8d2a6e0c15'
+down_revision = '9e0b7c4d1a86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reserved', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('stock_snapshot', schema=None) as batch_op:
+        batch_op.drop_column('movement_id')
+
+    # Reservations no longer reduce the quantity on hand
+    op.execute(
+        "UPDATE stock_snapshot SET quantity = quantity + (SELECT COALESCE(-SUM(quantity), 0) FROM stock_movement "
+        "WHERE stock_movement.stock_id = stock_snapshot.stock_id AND kind = 'reservation' "
+        "AND stock_movement.created_at <= stock_snapshot.taken_at)"
+    )
+    op.execute(
+        "UPDATE stock SET "
+        "quantity = quantity + (SELECT COALESCE(-SUM(quantity), 0) FROM stock_movement "
+        "WHERE stock_movement.stock_id = stock.id AND kind = 'reservation'), "
+        "reserved = (SELECT COALESCE(-SUM(quantity), 0) FROM stock_movement "
+        "WHERE stock_movement.stock_id = stock.id AND kind = 'reservation')"
+    )
+    op.execute("UPDATE stock_movement SET quantity = -quantity WHERE kind = 'reservation'")
+
+
+def downgrade():
+    op.execute("UPDATE stock_movement SET quantity = -quantity WHERE kind = 'reservation'")
+    op.execute("UPDATE stock_movement SET kind = 'adjustment', quantity = -quantity WHERE kind = 'release'")
+    op.execute("UPDATE stock SET quantity = quantity - reserved")
+    # Old snapshots were cut by movement id; let reads replay the ledger instead
+    op.execute("DELETE FROM stock_snapshot")
+    with op.batch_alter_table('stock_snapshot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('movement_id', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.drop_column('reserved')
@@ -0,0 +1,40 @@
+"""Add payment detail columns missing from the initial migration
+
+Revision ID: 5c7f1e3a9b24
+Revises: 4b8d2a6e0c15
+Create Date: 2026-10-20 10:12:47.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7f1e3a9b24'
+down_revision = '4b8d2a6e0c15'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('reference', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('receipt_path', sa.String(length=200), nullable=True),
+]
+
+
+def upgrade():
+    # Databases created with db.create_all() already have these columns
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('payment')}
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        for column in COLUMNS:
+            if column.name not in existing:
+                batch_op.add_column(column.copy())
+    op.execute("UPDATE payment SET status = 'Pending' WHERE status IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        for column in reversed(COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,42 @@
+"""Stop SQLite reusing ids of archived orders and documents
+
+Revision ID: 6d2a8f4c1e37
+Revises: 5c7f1e3a9b24
+Create Date: 2026-10-20 10:48:19.775031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2a8f4c1e37'
+down_revision = '5c7f1e3a9b24'
+branch_labels = None
+depends_on = None
+
+TABLES = ['order', 'invoice', 'payment', 'receipt', 'delivery_note']
+
+
+def upgrade():
+    # Postgres sequences never hand out an id twice; only SQLite needs this
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+        # Continue after the highest id ever used, archived rows included
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', MAX("
+            f"COALESCE((SELECT MAX(id) FROM \"{table}\"), 0), "
+            f"COALESCE((SELECT MAX(id) FROM {table}_archive), 0))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+            pass
@@ -0,0 +1,30 @@
+"""Index foreign keys used by the order view
+
+Revision ID: 7a3c5e2f9d61
+Revises: 1d9e4f7a3b58
+Create Date: 2026-10-19 16:02:11.847395
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c5e2f9d61'
+down_revision = '1d9e4f7a3b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_invoice_order_id'), 'invoice', ['order_id'], unique=False)
+    op.create_index(op.f('ix_payment_invoice_id'), 'payment', ['invoice_id'], unique=False)
+    op.create_index(op.f('ix_receipt_payment_id'), 'receipt', ['payment_id'], unique=False)
+    op.create_index(op.f('ix_delivery_note_order_id'), 'delivery_note', ['order_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_delivery_note_order_id'), table_name='delivery_note')
+    op.drop_index(op.f('ix_receipt_payment_id'), table_name='receipt')
+    op.drop_index(op.f('ix_payment_invoice_id'), table_name='payment')
+    op.drop_index(op.f('ix_invoice_order_id'), table_name='invoice')
@@ -0,0 +1,33 @@
+"""Stock forecast cache
+
+Revision ID: 8b61e0f4a2c9
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-19 10:41:07.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b61e0f4a2c9'
+down_revision = '3f2a9c1d7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_forecast',
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('avg_daily_demand', sa.Float(), nullable=False),
+    sa.Column('demand_std', sa.Float(), nullable=False),
+    sa.Column('safety_stock', sa.Float(), nullable=False),
+    sa.Column('reorder_point', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stock.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('stock_id')
+    )
+
+
+def downgrade():
+    op.drop_table('stock_forecast')
@@ -0,0 +1,40 @@
+"""Invoice updated_at for the overdue job
+
+Revision ID: 8f3b6d1c2a49
+Revises: 6d2a8f4c1e37
+Create Date: 2026-10-20 11:21:05.614392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f3b6d1c2a49'
+down_revision = '6d2a8f4c1e37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_invoice_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('invoice_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # Match SQLAlchemy's microsecond storage format so watermarks compare exactly
+        op.execute("UPDATE invoice SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', created_at)")
+    else:
+        op.execute('UPDATE invoice SET updated_at = created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('invoice_archive', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_invoice_updated_at'))
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,70 @@
+"""Change tracking and deletion log for delta sync
+
+Revision ID: 9e0b7c4d1a86
+Revises: 7a3c5e2f9d61
+Create Date: 2026-10-19 17:20:45.391027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e0b7c4d1a86'
+down_revision = '7a3c5e2f9d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('deletion_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deletion_log_table_name_id', 'deletion_log', ['table_name', 'id'], unique=False)
+    op.create_index(op.f('ix_stock_last_updated'), 'stock', ['last_updated'], unique=False)
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_order_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('delivery_note', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_delivery_note_updated_at'), ['updated_at'], unique=False)
+
+    with op.batch_alter_table('order_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('delivery_note_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # Match SQLAlchemy's microsecond storage format so sync cursors compare exactly
+        op.execute("UPDATE stock SET last_updated = strftime('%Y-%m-%d %H:%M:%f000', last_updated)")
+        op.execute("UPDATE \"order\" SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', created_at)")
+        op.execute("UPDATE delivery_note SET updated_at = strftime('%Y-%m-%d %H:%M:%f000', created_at)")
+    else:
+        op.execute('UPDATE "order" SET updated_at = created_at')
+        op.execute('UPDATE delivery_note SET updated_at = created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('delivery_note_archive', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('order_archive', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('delivery_note', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_delivery_note_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_updated_at'))
+        batch_op.drop_column('updated_at')
+
+    op.drop_index(op.f('ix_stock_last_updated'), table_name='stock')
+    op.drop_index('ix_deletion_log_table_name_id', table_name='deletion_log')
+    op.drop_table('deletion_log')
@@ -0,0 +1,50 @@
+"""Stop SQLite reusing ids of deleted stock items
+
+Revision ID: a2e7c9f4b318
+Revises: 8f3b6d1c2a49
+Create Date: 2026-10-21 09:17:36.408215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2e7c9f4b318'
+down_revision = '8f3b6d1c2a49'
+branch_labels = None
+depends_on = None
+
+HISTORY_TABLES = [('stock_movement', 'created_at'), ('stock_snapshot', 'taken_at')]
+
+
+def upgrade():
+    # History left behind by deleted items; where an id was already reused,
+    # rows from before its last deletion belong to the old item
+    for table, column in HISTORY_TABLES:
+        op.execute(
+            f"DELETE FROM {table} WHERE stock_id NOT IN (SELECT id FROM stock) "
+            f"OR {column} <= (SELECT MAX(deleted_at) FROM deletion_log "
+            f"WHERE table_name = 'stock' AND row_id = {table}.stock_id)"
+        )
+    op.execute('DELETE FROM stock_forecast WHERE stock_id NOT IN (SELECT id FROM stock)')
+
+    # Postgres sequences never hand out an id twice; only SQLite needs this
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('stock', recreate='always', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        pass
+    # Continue after the highest id ever used, deleted items included
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'stock'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'stock', MAX("
+        "COALESCE((SELECT MAX(id) FROM stock), 0), "
+        "COALESCE((SELECT MAX(row_id) FROM deletion_log WHERE table_name = 'stock'), 0))"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('stock', recreate='always', table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+        pass
@@ -0,0 +1,38 @@
+"""Version columns for optimistic concurrency
+
+Revision ID: c47d2e9a0f13
+Revises: 8b61e0f4a2c9
+Create Date: 2026-10-19 11:26:53.114870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d2e9a0f13'
+down_revision = '8b61e0f4a2c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.drop_column('version')
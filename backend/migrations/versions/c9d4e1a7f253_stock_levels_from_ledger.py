@@ -0,0 +1,78 @@
+"""Read stock levels from the ledger instead of the stock row
+
+Revision ID: c9d4e1a7f253
+Revises: a2e7c9f4b318
+Create Date: 2026-10-21 11:02:58.193640
+
+"""
+import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d4e1a7f253'
+down_revision = 'a2e7c9f4b318'
+branch_labels = None
+depends_on = None
+
+LEVEL = (
+    "COALESCE((SELECT {column} FROM stock_snapshot WHERE stock_snapshot.stock_id = stock.id "
+    "ORDER BY taken_at DESC, id DESC LIMIT 1), 0) + "
+    "COALESCE((SELECT SUM(quantity) FROM stock_movement WHERE stock_movement.stock_id = stock.id "
+    "AND kind IN ({kinds}) AND created_at > COALESCE((SELECT taken_at FROM stock_snapshot "
+    "WHERE stock_snapshot.stock_id = stock.id ORDER BY taken_at DESC, id DESC LIMIT 1), '1970-01-01')), 0)"
+)
+
+
+def upgrade():
+    with op.batch_alter_table('stock_snapshot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reserved', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('stock_movement', schema=None) as batch_op:
+        batch_op.create_index('ix_stock_movement_created_at', ['created_at'], unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # Match SQLAlchemy's microsecond storage format so ledger times compare exactly
+        op.execute(
+            "UPDATE stock_movement SET created_at = strftime('%Y-%m-%d %H:%M:%f000', created_at) "
+            "WHERE length(created_at) = 19"
+        )
+        op.execute(
+            "UPDATE stock_snapshot SET taken_at = strftime('%Y-%m-%d %H:%M:%f000', taken_at) "
+            "WHERE length(taken_at) = 19"
+        )
+
+    # The stock row held the current levels; they become one more snapshot
+    stock = sa.table('stock', sa.column('id'), sa.column('quantity'), sa.column('reserved'))
+    snapshot = sa.table(
+        'stock_snapshot', sa.column('stock_id'), sa.column('quantity'),
+        sa.column('reserved'), sa.column('taken_at', sa.DateTime())
+    )
+    op.execute(snapshot.insert().from_select(
+        ['stock_id', 'quantity', 'reserved', 'taken_at'],
+        sa.select(stock.c.id, stock.c.quantity, stock.c.reserved, sa.literal(datetime.datetime.utcnow(), sa.DateTime()))
+    ))
+
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.drop_column('reserved')
+        batch_op.drop_column('quantity')
+
+
+def downgrade():
+    with op.batch_alter_table('stock', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('reserved', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        'UPDATE stock SET quantity = '
+        + LEVEL.format(column='quantity', kinds="'receipt', 'delivery', 'adjustment'")
+        + ', reserved = '
+        + LEVEL.format(column='reserved', kinds="'reservation', 'release'")
+    )
+
+    with op.batch_alter_table('stock_movement', schema=None) as batch_op:
+        batch_op.drop_index('ix_stock_movement_created_at')
+
+    with op.batch_alter_table('stock_snapshot', schema=None) as batch_op:
+        batch_op.drop_column('reserved')
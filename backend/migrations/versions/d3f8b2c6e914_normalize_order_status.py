@@ -0,0 +1,38 @@
+"""Normalize legacy order statuses for the state machine
+
+Revision ID: d3f8b2c6e914
+Revises: c9d4e1a7f253
+Create Date: 2026-10-21 14:26:40.537812
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f8b2c6e914'
+down_revision = 'c9d4e1a7f253'
+branch_labels = None
+depends_on = None
+
+# Spellings the old free-form PUT accepted, after lower-casing
+LEGACY_STATUSES = {
+    'processing': 'confirmed',
+    'in transit': 'shipped',
+    'completed': 'delivered',
+    'complete': 'delivered',
+    'canceled': 'cancelled',
+}
+
+
+def upgrade():
+    for table in ('"order"', 'order_archive'):
+        op.execute(f'UPDATE {table} SET status = LOWER(TRIM(status)) WHERE status IS NOT NULL')
+        for legacy, status in LEGACY_STATUSES.items():
+            op.execute(f"UPDATE {table} SET status = '{status}' WHERE status = '{legacy}'")
+    op.execute('UPDATE "order" SET status = \'pending\' WHERE status IS NULL')
+
+
+def downgrade():
+    # The original spellings are not kept; the normalized values remain valid
+    pass
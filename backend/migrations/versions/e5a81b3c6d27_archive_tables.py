@@ -0,0 +1,83 @@
+"""Archive tables for closed orders
+
+Revision ID: e5a81b3c6d27
+Revises: c47d2e9a0f13
+Create Date: 2026-10-19 13:05:18.663021
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a81b3c6d27'
+down_revision = 'c47d2e9a0f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('order_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('customer_name', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('invoice_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('pdf_path', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_invoice_archive_order_id'), 'invoice_archive', ['order_id'], unique=False)
+    op.create_table('payment_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('invoice_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('paid_at', sa.DateTime(), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('reference', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('receipt_path', sa.String(length=200), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payment_archive_invoice_id'), 'payment_archive', ['invoice_id'], unique=False)
+    op.create_table('receipt_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('payment_id', sa.Integer(), nullable=False),
+    sa.Column('pdf_path', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_receipt_archive_payment_id'), 'receipt_archive', ['payment_id'], unique=False)
+    op.create_table('delivery_note_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('pdf_path', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_delivery_note_archive_order_id'), 'delivery_note_archive', ['order_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_delivery_note_archive_order_id'), table_name='delivery_note_archive')
+    op.drop_table('delivery_note_archive')
+    op.drop_index(op.f('ix_receipt_archive_payment_id'), table_name='receipt_archive')
+    op.drop_table('receipt_archive')
+    op.drop_index(op.f('ix_payment_archive_invoice_id'), table_name='payment_archive')
+    op.drop_table('payment_archive')
+    op.drop_index(op.f('ix_invoice_archive_order_id'), table_name='invoice_archive')
+    op.drop_table('invoice_archive')
+    op.drop_table('order_archive')
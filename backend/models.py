@@ -1,4 +1,5 @@
 from app import db
+import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
@@ -14,30 +15,103 @@ class User(db.Model):
         return check_password_hash(self.password_hash, password)
 
 class Stock(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}  # a new item must not inherit a deleted item's ledger
     id = db.Column(db.Integer, primary_key=True)
     item_name = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(100), nullable=False)
     unit_price = db.Column(db.Float, nullable=False)
+    # quantity and reserved are read from the ledger, see the end of this section
+    # Set in Python so values keep microseconds and delta-sync cursors compare exactly
+    last_updated = db.Column(db.DateTime, server_default=db.func.now(), default=datetime.datetime.utcnow,
+                             onupdate=datetime.datetime.utcnow, index=True)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
+
+class StockMovement(db.Model):
+    # Append-only: rows are never updated, and only deleted along with their item
+    id = db.Column(db.Integer, primary_key=True)
+    stock_id = db.Column(db.Integer, db.ForeignKey('stock.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # receipt, delivery, adjustment, reservation, release
+    quantity = db.Column(db.Integer, nullable=False)  # signed change in on-hand (or reserved) quantity
+    reference = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_stock_movement_stock_id_created_at', 'stock_id', 'created_at'),
+        db.Index('ix_stock_movement_created_at', 'created_at'),
+    )
+
+class StockSnapshot(db.Model):
+    # Quantities on hand and reserved including every movement created at or before taken_at
+    id = db.Column(db.Integer, primary_key=True)
+    stock_id = db.Column(db.Integer, db.ForeignKey('stock.id', ondelete='CASCADE'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
-    last_updated = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
-    
+    reserved = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    taken_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+
+    __table_args__ = (db.Index('ix_stock_snapshot_stock_id_taken_at', 'stock_id', 'taken_at'),)
+
+# Movement kinds that change the quantity on hand; reservations and releases
+# only change the reserved quantity
+ON_HAND_KINDS = ('receipt', 'delivery', 'adjustment')
+RESERVED_KINDS = ('reservation', 'release')
+
+def _current_level(kinds, snapshot_column):
+    # Latest snapshot plus the movements after it. Movements only append to the
+    # ledger, so writers never contend on the stock row.
+    latest = db.select(StockSnapshot.taken_at).where(StockSnapshot.stock_id == Stock.id).order_by(
+        StockSnapshot.taken_at.desc(), StockSnapshot.id.desc()
+    ).limit(1).correlate(Stock)
+    base = latest.with_only_columns(snapshot_column).scalar_subquery()
+    taken_at = db.func.coalesce(latest.scalar_subquery(), datetime.datetime(1970, 1, 1))
+    tail = db.select(db.func.sum(StockMovement.quantity)).where(
+        StockMovement.stock_id == Stock.id,
+        StockMovement.kind.in_(kinds),
+        StockMovement.created_at > taken_at
+    ).correlate(Stock).scalar_subquery()
+    return db.func.coalesce(base, 0) + db.func.coalesce(tail, 0)
+
+Stock.quantity = db.column_property(_current_level(ON_HAND_KINDS, StockSnapshot.quantity))
+Stock.reserved = db.column_property(_current_level(RESERVED_KINDS, StockSnapshot.reserved))
+
+class StockForecast(db.Model):
+    # Cached output of the nightly demand forecast, one row per item
+    stock_id = db.Column(db.Integer, db.ForeignKey('stock.id', ondelete='CASCADE'), primary_key=True)
+    avg_daily_demand = db.Column(db.Float, nullable=False)
+    demand_std = db.Column(db.Float, nullable=False)
+    safety_stock = db.Column(db.Float, nullable=False)
+    reorder_point = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+
 class Order(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}  # never reuse ids that were archived
     id = db.Column(db.Integer, primary_key=True)
     customer_name = db.Column(db.String(100), nullable=False)
     status = db.Column(db.String(20), default='pending')
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
     # ...add more fields as needed...
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
 
 class Invoice(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
     total_amount = db.Column(db.Float, nullable=False)
     pdf_path = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    due_date = db.Column(db.DateTime)  # created_at + INVOICE_TERMS_DAYS when unset
+    is_overdue = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    # Also bumped when one of its payments is deleted, for the overdue job
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
 
 class Payment(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    invoice_id = db.Column(db.Integer, db.ForeignKey('invoice.id'), nullable=False)
+    invoice_id = db.Column(db.Integer, db.ForeignKey('invoice.id'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
     paid_at = db.Column(db.DateTime, server_default=db.func.now())
     
@@ -47,18 +121,100 @@ class Payment(db.Model):
     reference = db.Column(db.String(100))  # Transaction reference
     notes = db.Column(db.Text)  # Additional notes
     receipt_path = db.Column(db.String(200))  # Path to uploaded receipt file
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationship
     invoice = db.relationship('Invoice', backref='payments')
 
 class Receipt(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    payment_id = db.Column(db.Integer, db.ForeignKey('payment.id'), nullable=False)
+    payment_id = db.Column(db.Integer, db.ForeignKey('payment.id'), nullable=False, index=True)
     pdf_path = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, server_default=db.func.now())
 
 class DeliveryNote(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
     pdf_path = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
+
+class JobState(db.Model):
+    # Bookkeeping for scheduler.py: last run and incremental watermark per job
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime)
+    last_run_at = db.Column(db.DateTime)
+
+class DeletionLog(db.Model):
+    # Tombstones for the delta-sync API
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, server_default=db.func.now())
+
+    __table_args__ = (db.Index('ix_deletion_log_table_name_id', 'table_name', 'id'),)
+
+class Notification(db.Model):
+    # Outbox drained by the send-notifications job
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    sent_at = db.Column(db.DateTime, index=True)
+
+# Archive tables hold closed order histories moved out of the live tables by
+# utils/archive.py. Rows keep their original ids and have no foreign keys.
+
+class OrderArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    customer_name = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+class InvoiceArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, nullable=False, index=True)
+    total_amount = db.Column(db.Float, nullable=False)
+    pdf_path = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime)
+    due_date = db.Column(db.DateTime)
+    is_overdue = db.Column(db.Boolean, nullable=False, server_default=db.false())
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+class PaymentArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    invoice_id = db.Column(db.Integer, nullable=False, index=True)
+    amount = db.Column(db.Float, nullable=False)
+    paid_at = db.Column(db.DateTime)
+    payment_method = db.Column(db.String(50))
+    status = db.Column(db.String(20))
+    reference = db.Column(db.String(100))
+    notes = db.Column(db.Text)
+    receipt_path = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+class ReceiptArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    payment_id = db.Column(db.Integer, nullable=False, index=True)
+    pdf_path = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
+
+class DeliveryNoteArchive(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, nullable=False, index=True)
+    pdf_path = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, server_default=db.func.now())
@@ -2,16 +2,18 @@ from flask_restful import Resource, reqparse
 from models import DeliveryNote, Order
 from app import db
 from resources.auth import role_required
+from utils.sync import log_deletion
+from utils.archive import find_record, is_archived
 from utils.pdf import generate_delivery_note_pdf
 
 class DeliveryNoteResource(Resource):
     @role_required(['Admin', 'Warehouse'])
     def get(self, id=None):
         if id:
-            note = DeliveryNote.query.get(id)
+            note = find_record(DeliveryNote, id)
             if not note:
                 return {'message': 'Not found'}, 404
-            return {'id': note.id, 'order_id': note.order_id, 'pdf_path': note.pdf_path}
+            return {'id': note.id, 'order_id': note.order_id, 'pdf_path': note.pdf_path, 'archived': is_archived(note)}
         notes = DeliveryNote.query.all()
         return [{'id': n.id, 'order_id': n.order_id, 'pdf_path': n.pdf_path} for n in notes]
 
@@ -33,6 +35,7 @@ class DeliveryNoteResource(Resource):
         note = DeliveryNote.query.get(id)
         if not note:
             return {'message': 'Not found'}, 404
+        log_deletion(DeliveryNote, note.id)
         db.session.delete(note)
         db.session.commit()
         return {'message': 'Delivery note deleted'}
@@ -0,0 +1,42 @@
+from flask_restful import Resource
+from flask import Response, request, stream_with_context
+from flask_jwt_extended import get_jwt
+import itertools
+from datetime import datetime
+from resources.auth import role_required
+from utils.export import EXPORT_TYPES, documents, stream_zip, stream_merged_pdf
+
+class ExportResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def get(self, doc_type):
+        if doc_type not in EXPORT_TYPES:
+            return {'message': 'Unknown document type'}, 404
+        model, lines, prefix, roles = EXPORT_TYPES[doc_type]
+        if get_jwt().get('role') not in roles:
+            return {'message': 'Access denied'}, 403
+        try:
+            start = datetime.fromisoformat(request.args['start'])
+            end = datetime.fromisoformat(request.args['end']) if request.args.get('end') else datetime.utcnow()
+        except KeyError:
+            return {'message': 'start is required'}, 400
+        except ValueError:
+            return {'message': 'Invalid date, use ISO 8601'}, 400
+        fmt = request.args.get('format', 'zip')
+        if fmt not in ('zip', 'pdf'):
+            return {'message': 'format must be zip or pdf'}, 400
+        records = documents(model, start, end)
+        # A PDF needs at least one page, so an empty range is a 404 for both formats
+        first = next(records, None)
+        if first is None:
+            return {'message': 'No documents in this date range'}, 404
+        records = itertools.chain([first], records)
+        filename = f'{prefix}s_{start:%Y%m%d}_{end:%Y%m%d}'
+        if fmt == 'zip':
+            body, mimetype = stream_zip(records, lines, prefix), 'application/zip'
+        else:
+            body, mimetype = stream_merged_pdf(records, lines), 'application/pdf'
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}.{fmt}'}
+        )
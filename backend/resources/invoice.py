@@ -1,27 +1,30 @@
 from flask_restful import Resource, reqparse
+from datetime import datetime
 from models import Invoice, Order
 from app import db
 from resources.auth import role_required
+from utils.archive import find_record, is_archived
 from utils.pdf import generate_invoice_pdf
 
 class InvoiceResource(Resource):
     @role_required(['Admin', 'Sales'])
     def get(self, id=None):
         if id:
-            invoice = Invoice.query.get(id)
+            invoice = find_record(Invoice, id)
             if not invoice:
                 return {'message': 'Not found'}, 404
-            return {'id': invoice.id, 'order_id': invoice.order_id, 'total_amount': invoice.total_amount, 'pdf_path': invoice.pdf_path}
+            return {'id': invoice.id, 'order_id': invoice.order_id, 'total_amount': invoice.total_amount, 'pdf_path': invoice.pdf_path, 'due_date': invoice.due_date.isoformat() if invoice.due_date else None, 'is_overdue': invoice.is_overdue, 'archived': is_archived(invoice)}
         invoices = Invoice.query.all()
-        return [{'id': i.id, 'order_id': i.order_id, 'total_amount': i.total_amount, 'pdf_path': i.pdf_path} for i in invoices]
+        return [{'id': i.id, 'order_id': i.order_id, 'total_amount': i.total_amount, 'pdf_path': i.pdf_path, 'is_overdue': i.is_overdue} for i in invoices]
 
     @role_required(['Admin', 'Sales'])
     def post(self):
         parser = reqparse.RequestParser()
         parser.add_argument('order_id', type=int, required=True)
         parser.add_argument('total_amount', type=float, required=True)
+        parser.add_argument('due_date', type=datetime.fromisoformat)
         args = parser.parse_args()
-        invoice = Invoice(order_id=args['order_id'], total_amount=args['total_amount'])
+        invoice = Invoice(order_id=args['order_id'], total_amount=args['total_amount'], due_date=args['due_date'])
         db.session.add(invoice)
         db.session.commit()
         # Generate PDF
@@ -1,16 +1,26 @@
 from flask_restful import Resource, reqparse
-from models import Order
+from flask import request
+from flask_jwt_extended import get_jwt
+from datetime import datetime
+from models import Order, Invoice, Payment, Receipt, DeliveryNote
 from app import db
+from sqlalchemy.orm.exc import StaleDataError
 from resources.auth import role_required
+from utils.sync import log_deletion
+from utils.archive import ARCHIVE_MODELS, find_record, is_archived
+from utils.concurrency import etag_header, not_modified, precondition_failed
+from utils.order_status import can_transition, transition_orders, create_delivery_notes
 
 class OrderResource(Resource):
     @role_required(['Admin', 'Sales'])
     def get(self, id=None):
         if id:
-            order = Order.query.get(id)
+            order = find_record(Order, id)
             if not order:
                 return {'message': 'Not found'}, 404
-            return {'id': order.id, 'customer_name': order.customer_name, 'status': order.status}
+            if not_modified(order):
+                return '', 304, etag_header(order)
+            return {'id': order.id, 'customer_name': order.customer_name, 'status': order.status, 'archived': is_archived(order)}, 200, etag_header(order)
         orders = Order.query.all()
         return [{'id': o.id, 'customer_name': o.customer_name, 'status': o.status} for o in orders]
 
@@ -29,19 +39,167 @@ class OrderResource(Resource):
         order = Order.query.get(id)
         if not order:
             return {'message': 'Not found'}, 404
+        if precondition_failed(order):
+            return {'message': 'Order has been modified'}, 412
         parser = reqparse.RequestParser()
         parser.add_argument('status')
         args = parser.parse_args()
-        if args['status']:
+        if args['status'] and args['status'] != order.status:
+            if not can_transition(order.status, args['status']):
+                return {'message': f"Cannot change status from {order.status} to {args['status']}"}, 409
             order.status = args['status']
-        db.session.commit()
-        return {'message': 'Order updated'}
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return {'message': 'Order has been modified'}, 412
+        return {'message': 'Order updated'}, 200, etag_header(order)
 
     @role_required(['Admin'])
     def delete(self, id):
         order = Order.query.get(id)
         if not order:
             return {'message': 'Not found'}, 404
-        db.session.delete(order)
-        db.session.commit()
+        if precondition_failed(order):
+            return {'message': 'Order has been modified'}, 412
+        try:
+            log_deletion(Order, order.id)
+            db.session.delete(order)
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return {'message': 'Order has been modified'}, 412
         return {'message': 'Order deleted'}
+
+
+TRANSITION_FILTERS = ('status', 'customer_name', 'created_before', 'created_after')
+
+# target status -> roles allowed to move orders there; Warehouse only dispatches
+TRANSITION_ROLES = {
+    'confirmed': ['Admin', 'Sales'],
+    'shipped': ['Admin', 'Sales', 'Warehouse'],
+    'delivered': ['Admin', 'Sales', 'Warehouse'],
+    'cancelled': ['Admin', 'Sales'],
+}
+
+class OrderTransitionResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def post(self):
+        # Body: {"status": ..., "ids": [...]} or {"status": ..., "filter": {...}}
+        data = request.get_json(force=True)
+        if not isinstance(data, dict):
+            return {'message': 'Body must be a JSON object'}, 400
+        target = data.get('status')
+        if get_jwt().get('role') not in TRANSITION_ROLES.get(target, ['Admin', 'Sales']):
+            return {'message': 'Access denied'}, 403
+        ids = data.get('ids')
+        filters = data.get('filter')
+        if (ids is None) == (filters is None):
+            return {'message': 'Provide either ids or a filter'}, 400
+        if ids is not None and not (
+            isinstance(ids, list) and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+        ):
+            return {'message': 'ids must be a list of integers'}, 400
+        if filters is not None:
+            if not isinstance(filters, dict) or not all(isinstance(v, str) for v in filters.values()):
+                return {'message': 'filter must be an object of strings'}, 400
+            unknown = set(filters) - set(TRANSITION_FILTERS)
+            if unknown:
+                return {'message': f"Unknown filter: {', '.join(sorted(unknown))}"}, 400
+            # An empty filter would match every order in an allowed state
+            if not any(filters.values()):
+                return {'message': 'filter needs at least one condition'}, 400
+        else:
+            filters = {}
+        conditions = []
+        try:
+            if filters.get('status'):
+                conditions.append(Order.status == filters['status'])
+            if filters.get('customer_name'):
+                conditions.append(Order.customer_name == filters['customer_name'])
+            if filters.get('created_before'):
+                conditions.append(Order.created_at < datetime.fromisoformat(filters['created_before']))
+            if filters.get('created_after'):
+                conditions.append(Order.created_at >= datetime.fromisoformat(filters['created_after']))
+            updated, rejected = transition_orders(target, ids, conditions)
+        except (TypeError, ValueError) as e:
+            return {'message': str(e)}, 400
+        notes = []
+        if target == 'shipped' and data.get('create_delivery_notes'):
+            notes = create_delivery_notes(updated)
+        db.session.commit()
+        return {'status': target, 'updated': updated, 'rejected': rejected, 'delivery_notes': notes}
+
+
+# section -> roles allowed to read it, same as the section's own endpoint
+ORDER_VIEW_INCLUDES = {
+    'invoices': ['Admin', 'Sales'],
+    'payments': ['Admin', 'Sales'],
+    'receipts': ['Admin', 'Sales'],
+    'delivery_notes': ['Admin', 'Warehouse'],
+}
+
+class OrderViewResource(Resource):
+    @role_required(['Admin', 'Sales'])
+    def get(self, id):
+        order = find_record(Order, id)
+        if not order:
+            return {'message': 'Not found'}, 404
+        role = get_jwt().get('role')
+        include = [s.strip() for s in request.args.get('include', '').split(',') if s.strip()]
+        unknown = set(include) - set(ORDER_VIEW_INCLUDES)
+        if unknown:
+            return {'message': f"Unknown include: {', '.join(sorted(unknown))}"}, 400
+        if any(role not in ORDER_VIEW_INCLUDES[s] for s in include):
+            return {'message': 'Access denied'}, 403
+        # Without include, return every section the caller may see
+        include = include or [s for s, roles in ORDER_VIEW_INCLUDES.items() if role in roles]
+
+        # Archived orders keep their documents in the archive tables
+        archived = is_archived(order)
+        invoice_model, payment_model, receipt_model, note_model = (
+            ARCHIVE_MODELS[m] if archived else m for m in (Invoice, Payment, Receipt, DeliveryNote)
+        )
+        # One query per section; parents are resolved through subqueries
+        invoice_ids = db.select(invoice_model.id).where(invoice_model.order_id == id)
+        payment_ids = db.select(payment_model.id).where(payment_model.invoice_id.in_(invoice_ids))
+
+        view = {'order': {'id': order.id, 'customer_name': order.customer_name, 'status': order.status, 'archived': archived}}
+        if 'invoices' in include:
+            view['invoices'] = [
+                {
+                    'id': i.id,
+                    'order_id': i.order_id,
+                    'total_amount': i.total_amount,
+                    'pdf_path': i.pdf_path,
+                    'due_date': i.due_date.isoformat() if i.due_date else None,
+                    'is_overdue': i.is_overdue
+                }
+                for i in invoice_model.query.filter(invoice_model.order_id == id).order_by(invoice_model.id)
+            ]
+        if 'payments' in include:
+            view['payments'] = [
+                {
+                    'id': p.id,
+                    'invoice_id': p.invoice_id,
+                    'amount': p.amount,
+                    'payment_method': p.payment_method,
+                    'payment_date': p.paid_at.isoformat() if p.paid_at else None,
+                    'status': p.status,
+                    'reference': p.reference,
+                    'notes': p.notes,
+                    'receipt_path': p.receipt_path
+                }
+                for p in payment_model.query.filter(payment_model.invoice_id.in_(invoice_ids)).order_by(payment_model.id)
+            ]
+        if 'receipts' in include:
+            view['receipts'] = [
+                {'id': r.id, 'payment_id': r.payment_id, 'pdf_path': r.pdf_path}
+                for r in receipt_model.query.filter(receipt_model.payment_id.in_(payment_ids)).order_by(receipt_model.id)
+            ]
+        if 'delivery_notes' in include:
+            view['delivery_notes'] = [
+                {'id': n.id, 'order_id': n.order_id, 'pdf_path': n.pdf_path}
+                for n in note_model.query.filter(note_model.order_id == id).order_by(note_model.id)
+            ]
+        return view
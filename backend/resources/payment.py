@@ -1,18 +1,24 @@
 from flask_restful import Resource, reqparse
 from flask import request
 import os
+import datetime
 from werkzeug.utils import secure_filename
 from models import Payment, Invoice
 from app import db
+from sqlalchemy.orm.exc import StaleDataError
 from resources.auth import role_required
+from utils.archive import customer_name_for, find_record, is_archived
+from utils.concurrency import etag_header, not_modified, precondition_failed
 
 class PaymentResource(Resource):
     @role_required(['Admin', 'Sales'])
     def get(self, id=None):
         if id:
-            payment = Payment.query.get(id)
+            payment = find_record(Payment, id)
             if not payment:
                 return {'message': 'Payment not found'}, 404
+            if not_modified(payment):
+                return '', 304, etag_header(payment)
             
             return {
                 'id': payment.id,
@@ -24,8 +30,9 @@ class PaymentResource(Resource):
                 'reference': getattr(payment, 'reference', None),
                 'notes': getattr(payment, 'notes', None),
                 'receipt_path': getattr(payment, 'receipt_path', None),
-                'customer_name': payment.invoice.order.customer_name if payment.invoice and payment.invoice.order else None
-            }
+                'customer_name': customer_name_for(payment),
+                'archived': is_archived(payment)
+            }, 200, etag_header(payment)
         
         payments = Payment.query.all()
         payment_list = []
@@ -94,6 +101,8 @@ class PaymentResource(Resource):
         payment = Payment.query.get(id)
         if not payment:
             return {'message': 'Payment not found'}, 404
+        if precondition_failed(payment):
+            return {'message': 'Payment has been modified'}, 412
             
         parser = reqparse.RequestParser()
         parser.add_argument('amount', type=float)
@@ -116,17 +125,29 @@ class PaymentResource(Resource):
         if args['notes'] and hasattr(payment, 'notes'):
             payment.notes = args['notes']
             
-        db.session.commit()
+        try:
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return {'message': 'Payment has been modified'}, 412
         
-        return {'message': 'Payment updated successfully'}
+        return {'message': 'Payment updated successfully'}, 200, etag_header(payment)
 
     @role_required(['Admin'])
     def delete(self, id):
         payment = Payment.query.get(id)
         if not payment:
             return {'message': 'Payment not found'}, 404
-        db.session.delete(payment)
-        db.session.commit()
+        if precondition_failed(payment):
+            return {'message': 'Payment has been modified'}, 412
+        try:
+            # The payment row is gone afterwards; the invoice carries the change
+            payment.invoice.updated_at = datetime.datetime.utcnow()
+            db.session.delete(payment)
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return {'message': 'Payment has been modified'}, 412
         return {'message': 'Payment deleted successfully'}
 
 
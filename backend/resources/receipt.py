@@ -2,16 +2,17 @@ from flask_restful import Resource, reqparse
 from models import Receipt, Payment
 from app import db
 from resources.auth import role_required
+from utils.archive import find_record, is_archived
 from utils.pdf import generate_receipt_pdf
 
 class ReceiptResource(Resource):
     @role_required(['Admin', 'Sales'])
     def get(self, id=None):
         if id:
-            receipt = Receipt.query.get(id)
+            receipt = find_record(Receipt, id)
             if not receipt:
                 return {'message': 'Not found'}, 404
-            return {'id': receipt.id, 'payment_id': receipt.payment_id, 'pdf_path': receipt.pdf_path}
+            return {'id': receipt.id, 'payment_id': receipt.payment_id, 'pdf_path': receipt.pdf_path, 'archived': is_archived(receipt)}
         receipts = Receipt.query.all()
         return [{'id': r.id, 'payment_id': r.payment_id, 'pdf_path': r.pdf_path} for r in receipts]
 
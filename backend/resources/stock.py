@@ -1,8 +1,43 @@
 from flask_restful import Resource, reqparse
 from flask import request
-from models import Stock
+from datetime import datetime
+from models import Stock, StockMovement, StockSnapshot, StockForecast
 from app import db
+from sqlalchemy.orm.exc import StaleDataError
 from resources.auth import role_required
+from utils.sync import log_deletion
+from utils.concurrency import etag_header, not_modified, precondition_failed
+from utils.ledger import record_movement, quantity_at, movements_between
+
+def parse_datetime(value, default=None):
+    if not value:
+        return default
+    return datetime.fromisoformat(value)
+
+def level(s):
+    # Part of the stock ETag: movements change these without touching the row
+    return s.quantity, s.reserved
+
+def stock_to_dict(s):
+    return {
+        'id': s.id,
+        'item_name': s.item_name,
+        'category': s.category,
+        'unit_price': s.unit_price,
+        'quantity': s.quantity,
+        'reserved': s.reserved,
+        'last_updated': s.last_updated.isoformat() if s.last_updated else None
+    }
+
+def movement_to_dict(m):
+    return {
+        'id': m.id,
+        'stock_id': m.stock_id,
+        'kind': m.kind,
+        'quantity': m.quantity,
+        'reference': m.reference,
+        'created_at': m.created_at.isoformat() if m.created_at else None
+    }
 
 class StockResource(Resource):
     @role_required(['Admin','Sales', 'Warehouse'])
@@ -11,26 +46,11 @@ class StockResource(Resource):
             stock = Stock.query.get(id)
             if not stock:
                 return {'message': 'Not found'}, 404
-            return {
-                'id': stock.id,
-                'item_name': stock.item_name,
-                'category': stock.category,
-                'unit_price': stock.unit_price,
-                'quantity': stock.quantity,
-                'last_updated': stock.last_updated.isoformat() if stock.last_updated else None
-            }
+            if not_modified(stock, *level(stock)):
+                return '', 304, etag_header(stock, *level(stock))
+            return stock_to_dict(stock), 200, etag_header(stock, *level(stock))
         stocks = Stock.query.all()
-        return [
-            {
-                'id': s.id,
-                'item_name': s.item_name,
-                'category': s.category,
-                'unit_price': s.unit_price,
-                'quantity': s.quantity,
-                'last_updated': s.last_updated.isoformat() if s.last_updated else None
-            }
-            for s in stocks
-        ]
+        return [stock_to_dict(s) for s in stocks]
 
     @role_required(['Admin', 'Warehouse'])
     def post(self):
@@ -48,40 +68,120 @@ class StockResource(Resource):
             stock = Stock(
                 item_name=item_name,
                 category=category,
-                unit_price=unit_price,
-                quantity=quantity
+                unit_price=unit_price
             )
             db.session.add(stock)
             db.session.flush()  # get id before commit
-            created.append({
-                "id": stock.id,
-                "item_name": stock.item_name,
-                "category": stock.category,
-                "unit_price": stock.unit_price,
-                "quantity": stock.quantity,
-                "last_updated": stock.last_updated.isoformat() if stock.last_updated else None
-            })
+            db.session.add(StockMovement(stock_id=stock.id, kind='receipt', quantity=quantity, reference='Opening balance'))
+            created.append(stock)
         db.session.commit()
-        return created, 201
+        return [stock_to_dict(s) for s in created], 201
 
     @role_required(['Admin', 'Warehouse'])
     def put(self, id):
         stock = Stock.query.get(id)
         if not stock:
             return {'message': 'Not found'}, 404
+        if precondition_failed(stock, *level(stock)):
+            return {'message': 'Stock has been modified'}, 412
         parser = reqparse.RequestParser()
         parser.add_argument('quantity', type=int)
+        parser.add_argument('reference')
         args = parser.parse_args()
-        if args['quantity'] is not None:
-            stock.quantity = args['quantity']
+        # The adjustment is worked out from the level read above; If-Match keeps
+        # clients from setting a count taken before later movements
+        if args['quantity'] is not None and args['quantity'] != stock.quantity:
+            record_movement(stock.id, 'adjustment', args['quantity'] - stock.quantity, args['reference'])
         db.session.commit()
-        return {'message': 'Stock updated'}
+        return {'message': 'Stock updated'}, 200, etag_header(stock, *level(stock))
 
     @role_required(['Admin'])
     def delete(self, id):
         stock = Stock.query.get(id)
         if not stock:
             return {'message': 'Not found'}, 404
-        db.session.delete(stock)
-        db.session.commit()
+        if precondition_failed(stock, *level(stock)):
+            return {'message': 'Stock has been modified'}, 412
+        try:
+            log_deletion(Stock, stock.id)
+            # SQLite does not enforce ON DELETE CASCADE unless foreign keys are switched on
+            for model in (StockMovement, StockSnapshot, StockForecast):
+                model.query.filter_by(stock_id=stock.id).delete(synchronize_session=False)
+            db.session.delete(stock)
+            db.session.commit()
+        except StaleDataError:
+            db.session.rollback()
+            return {'message': 'Stock has been modified'}, 412
         return {'message': 'Stock deleted'}
+
+
+class StockMovementResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def get(self, id):
+        if not Stock.query.get(id):
+            return {'message': 'Not found'}, 404
+        try:
+            end = parse_datetime(request.args.get('end'), datetime.utcnow())
+            start = parse_datetime(request.args.get('start'), datetime.min)
+        except ValueError:
+            return {'message': 'Invalid date, use ISO 8601'}, 400
+        movements = movements_between(id, start, end)
+        return {
+            'stock_id': id,
+            'opening_quantity': quantity_at(id, start),
+            'closing_quantity': quantity_at(id, end),
+            'movements': [movement_to_dict(m) for m in movements]
+        }
+
+    @role_required(['Admin', 'Warehouse'])
+    def post(self, id):
+        if not Stock.query.get(id):
+            return {'message': 'Not found'}, 404
+        parser = reqparse.RequestParser()
+        parser.add_argument('kind', required=True)
+        parser.add_argument('quantity', type=int, required=True)
+        parser.add_argument('reference')
+        args = parser.parse_args()
+        try:
+            movement = record_movement(id, args['kind'], args['quantity'], args['reference'])
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        db.session.commit()
+        return movement_to_dict(movement), 201
+
+class StockLevelResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def get(self, id):
+        if not Stock.query.get(id):
+            return {'message': 'Not found'}, 404
+        try:
+            at = parse_datetime(request.args.get('at'), datetime.utcnow())
+        except ValueError:
+            return {'message': 'Invalid date, use ISO 8601'}, 400
+        return {'stock_id': id, 'at': at.isoformat(), 'quantity': quantity_at(id, at)}
+
+class StockReorderResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def get(self):
+        # Reserved units are still on hand but already promised to orders
+        available = Stock.quantity - Stock.reserved
+        rows = db.session.query(Stock, StockForecast).join(
+            StockForecast, StockForecast.stock_id == Stock.id
+        ).filter(available <= StockForecast.reorder_point).order_by(
+            (StockForecast.reorder_point - available).desc()
+        ).all()
+        return [
+            {
+                'id': s.id,
+                'item_name': s.item_name,
+                'category': s.category,
+                'quantity': s.quantity,
+                'reserved': s.reserved,
+                'available': s.quantity - s.reserved,
+                'avg_daily_demand': f.avg_daily_demand,
+                'safety_stock': f.safety_stock,
+                'reorder_point': f.reorder_point,
+                'computed_at': f.computed_at.isoformat() if f.computed_at else None
+            }
+            for s, f in rows
+        ]
@@ -0,0 +1,52 @@
+from flask_restful import Resource
+from flask import current_app, request
+from flask_jwt_extended import get_jwt
+from binascii import Error as Base64Error
+from models import Stock, StockMovement, Order, DeliveryNote
+from resources.auth import role_required
+from resources.stock import stock_to_dict
+from utils.sync import changes_since
+
+def order_to_dict(o):
+    return {'id': o.id, 'customer_name': o.customer_name, 'status': o.status}
+
+def delivery_note_to_dict(n):
+    return {'id': n.id, 'order_id': n.order_id, 'pdf_path': n.pdf_path}
+
+# resource -> (model, (row id, change time) sources, serializer, roles)
+SYNC_RESOURCES = {
+    'stock': (
+        Stock,
+        # Levels change through the ledger without touching the stock row
+        [(Stock.id, Stock.last_updated), (StockMovement.stock_id, StockMovement.created_at)],
+        stock_to_dict,
+        ['Admin', 'Sales', 'Warehouse']
+    ),
+    'orders': (Order, [(Order.id, Order.updated_at)], order_to_dict, ['Admin', 'Sales']),
+    'delivery-notes': (DeliveryNote, [(DeliveryNote.id, DeliveryNote.updated_at)], delivery_note_to_dict, ['Admin', 'Warehouse']),
+}
+
+MAX_LIMIT = 5000
+
+class SyncResource(Resource):
+    @role_required(['Admin', 'Sales', 'Warehouse'])
+    def get(self, resource):
+        if resource not in SYNC_RESOURCES:
+            return {'message': 'Unknown resource'}, 404
+        model, sources, to_dict, roles = SYNC_RESOURCES[resource]
+        if get_jwt().get('role') not in roles:
+            return {'message': 'Access denied'}, 403
+        try:
+            limit = max(1, min(int(request.args.get('limit', 1000)), MAX_LIMIT))
+            rows, deleted, watermark, has_more = changes_since(
+                model, sources, request.args.get('since'), limit,
+                current_app.config['SYNC_SETTLE_SECONDS']
+            )
+        except (ValueError, TypeError, Base64Error):
+            return {'message': 'Invalid since or limit'}, 400
+        return {
+            'changes': [to_dict(r) for r in rows],
+            'deleted': deleted,
+            'watermark': watermark,
+            'has_more': has_more
+        }
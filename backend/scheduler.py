@@ -0,0 +1,84 @@
+import datetime
+import sys
+import time
+import traceback
+from app import create_app, db
+
+# Each job takes the app config and returns a one-line summary
+
+def snapshot_stock(config):
+    from utils.ledger import take_snapshots
+    return f'Snapshotted {take_snapshots()} stock items'
+
+def forecast_stock(config):
+    from utils.forecast import compute_forecasts
+    count = compute_forecasts(
+        method=config['FORECAST_METHOD'],
+        history_days=config['FORECAST_HISTORY_DAYS'],
+        lead_time_days=config['FORECAST_LEAD_TIME_DAYS']
+    )
+    return f'Forecast {count} stock items'
+
+def archive_records(config):
+    from utils.archive import run_archive
+    count = run_archive(config['ARCHIVE_HORIZON_DAYS'], config['ARCHIVE_BATCH_SIZE'])
+    return f'Archived {count} orders'
+
+def overdue_invoices(config):
+    from utils.overdue import detect_overdue
+    flagged, cleared = detect_overdue(config['INVOICE_TERMS_DAYS'])
+    return f'Flagged {flagged} overdue invoices, cleared {cleared}'
+
+def send_notifications(config):
+    from utils.notify import get_sender, dispatch_notifications
+    return f'Sent {dispatch_notifications(get_sender(config))} notifications'
+
+# name -> (job, interval in seconds)
+JOBS = {
+    'snapshot-stock': (snapshot_stock, 60 * 60),
+    'forecast-stock': (forecast_stock, 24 * 60 * 60),
+    'archive-records': (archive_records, 24 * 60 * 60),
+    'overdue-invoices': (overdue_invoices, 24 * 60 * 60),
+    'send-notifications': (send_notifications, 5 * 60),
+}
+
+def run_job(app, name):
+    from models import JobState
+    with app.app_context():
+        job, _ = JOBS[name]
+        print(f'{name}: {job(app.config)}')
+        state = db.session.get(JobState, name) or JobState(name=name)
+        state.last_run_at = datetime.datetime.utcnow()
+        db.session.add(state)
+        db.session.commit()
+
+def due_jobs(app):
+    from models import JobState
+    with app.app_context():
+        last_runs = {s.name: s.last_run_at for s in JobState.query.all()}
+    now = datetime.datetime.utcnow()
+    return [
+        name for name, (_, interval) in JOBS.items()
+        if not last_runs.get(name) or (now - last_runs[name]).total_seconds() >= interval
+    ]
+
+def run_forever(app, poll_seconds=30):
+    while True:
+        for name in due_jobs(app):
+            try:
+                run_job(app, name)
+            except Exception:
+                traceback.print_exc()
+                with app.app_context():
+                    db.session.rollback()
+        time.sleep(poll_seconds)
+
+if __name__ == "__main__":
+    # python scheduler.py            run every job on its interval
+    # python scheduler.py <job>...   run the given jobs once
+    app = create_app()
+    if len(sys.argv) > 1:
+        for name in sys.argv[1:]:
+            run_job(app, name)
+    else:
+        run_forever(app)
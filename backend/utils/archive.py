@@ -0,0 +1,77 @@
+import datetime
+from sqlalchemy import delete, insert, select
+from models import (
+    Order, Invoice, Payment, Receipt, DeliveryNote,
+    OrderArchive, InvoiceArchive, PaymentArchive, ReceiptArchive, DeliveryNoteArchive
+)
+from app import db
+from utils.balances import outstanding
+from utils.order_status import CLOSED_ORDER_STATUSES
+from utils.sync import log_deletions
+
+ARCHIVE_MODELS = {
+    Order: OrderArchive,
+    Invoice: InvoiceArchive,
+    Payment: PaymentArchive,
+    Receipt: ReceiptArchive,
+    DeliveryNote: DeliveryNoteArchive,
+}
+
+def find_record(model, id):
+    """Look a record up in its live table, falling back to the archive."""
+    return db.session.get(model, id) or db.session.get(ARCHIVE_MODELS[model], id)
+
+def customer_name_for(payment):
+    """Customer of a live or archived payment, through its invoice and order."""
+    invoice = find_record(Invoice, payment.invoice_id)
+    order = invoice and find_record(Order, invoice.order_id)
+    return order.customer_name if order else None
+
+def is_archived(record):
+    return type(record) in ARCHIVE_MODELS.values()
+
+def archivable_orders(cutoff):
+    """Closed orders created before `cutoff` whose invoices are all settled."""
+    return select(Order.id).where(
+        Order.status.in_(CLOSED_ORDER_STATUSES),
+        Order.created_at < cutoff,
+        ~select(Invoice.id).where(Invoice.order_id == Order.id, outstanding(Invoice)).exists()
+    ).order_by(Order.id)
+
+def _move(model, condition):
+    columns = [c.name for c in model.__table__.columns]
+    db.session.execute(
+        insert(ARCHIVE_MODELS[model]).from_select(columns, select(*model.__table__.columns).where(condition))
+    )
+
+def archive_orders(order_ids):
+    """Move the given orders and everything hanging off them to the archive."""
+    invoice_ids = select(Invoice.id).where(Invoice.order_id.in_(order_ids))
+    payment_ids = select(Payment.id).where(Payment.invoice_id.in_(invoice_ids))
+    # Children first so deletes never leave dangling foreign keys
+    moves = [
+        (Receipt, Receipt.payment_id.in_(payment_ids)),
+        (Payment, Payment.id.in_(payment_ids)),
+        (Invoice, Invoice.id.in_(invoice_ids)),
+        (DeliveryNote, DeliveryNote.order_id.in_(order_ids)),
+        (Order, Order.id.in_(order_ids)),
+    ]
+    for model, condition in moves:
+        _move(model, condition)
+    # Archived orders and notes leave the live tables, so sync clients drop them
+    log_deletions(Order, Order.id.in_(order_ids))
+    log_deletions(DeliveryNote, DeliveryNote.order_id.in_(order_ids))
+    for model, condition in moves:
+        db.session.execute(delete(model).where(condition).execution_options(synchronize_session=False))
+
+def run_archive(horizon_days=365, batch_size=500):
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=horizon_days)
+    total = 0
+    while True:
+        order_ids = db.session.scalars(archivable_orders(cutoff).limit(batch_size)).all()
+        if not order_ids:
+            break
+        archive_orders(order_ids)
+        db.session.commit()
+        total += len(order_ids)
+    return total
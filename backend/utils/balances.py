@@ -0,0 +1,22 @@
+from sqlalchemy import func, select
+from models import Payment
+
+# Only payments in these statuses count towards an invoice's balance
+SETTLED_PAYMENT_STATUSES = ('Received',)
+
+def paid_amount(invoice_id):
+    """Settled payments for `invoice_id`, correlated to the enclosing query.
+
+    Evaluated per candidate invoice through the payment.invoice_id index, so
+    callers only pay for the invoices they actually look at.
+    """
+    return func.coalesce(
+        select(func.sum(Payment.amount)).where(
+            Payment.invoice_id == invoice_id, Payment.status.in_(SETTLED_PAYMENT_STATUSES)
+        ).correlate_except(Payment).scalar_subquery(),
+        0
+    )
+
+def outstanding(invoice):
+    """Condition: the invoice's settled payments do not cover its total."""
+    return invoice.total_amount > paid_amount(invoice.id)
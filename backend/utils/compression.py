@@ -0,0 +1,81 @@
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/msgpack', 'text/html', 'text/plain', 'text/csv'}
+
+# Each factory returns (compress(chunk), flush()) for one response
+def _gzip():
+    c = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return c.compress, c.flush
+
+def _brotli():
+    c = brotli.Compressor(quality=5)
+    return c.process, c.finish
+
+def _zstd():
+    c = zstandard.ZstdCompressor(level=3).compressobj()
+    return c.compress, c.flush
+
+# Server preference order when the client weights encodings equally
+ENCODINGS = {}
+if zstandard is not None:
+    ENCODINGS['zstd'] = _zstd
+if brotli is not None:
+    ENCODINGS['br'] = _brotli
+ENCODINGS['gzip'] = _gzip
+
+def _compress_stream(chunks, factory):
+    compress, flush = factory()
+    for chunk in chunks:
+        data = compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield flush()
+
+def _coded_etag(response, encoding):
+    # Each content coding is a different representation, so it needs its own ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+
+def init_compression(app, min_size=1024):
+    @app.after_request
+    def compress_response(response):
+        if response.status_code == 304:
+            # Echo the coded ETag the client revalidated with, if any
+            etag, _ = response.get_etag()
+            for encoding in ENCODINGS:
+                if etag and request.if_none_match.contains_weak(f'{etag}-{encoding}'):
+                    _coded_etag(response, encoding)
+                    break
+            return response
+        if (response.status_code < 200 or response.status_code == 204
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(list(ENCODINGS))
+        if not encoding:
+            return response
+        factory = ENCODINGS[encoding]
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, factory)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(b''.join(_compress_stream([data], factory)))
+        response.headers['Content-Encoding'] = encoding
+        _coded_etag(response, encoding)
+        return response
@@ -0,0 +1,23 @@
+from flask import request
+from werkzeug.http import quote_etag
+
+def etag_for(obj, *state):
+    # `state` covers values that change without bumping the version column
+    return '-'.join(str(part) for part in (obj.__tablename__, obj.id, obj.version, *state))
+
+# Codings utils.compression may append to an ETag; matching ignores them
+CONTENT_CODINGS = ('zstd', 'br', 'gzip')
+
+def _etag_variants(obj, *state):
+    etag = etag_for(obj, *state)
+    return [etag] + [f'{etag}-{coding}' for coding in CONTENT_CODINGS]
+
+def etag_header(obj, *state):
+    return {'ETag': quote_etag(etag_for(obj, *state))}
+
+def precondition_failed(obj, *state):
+    # A missing If-Match header is allowed; the version column still guards the write
+    return bool(request.if_match) and not any(request.if_match.contains(t) for t in _etag_variants(obj, *state))
+
+def not_modified(obj, *state):
+    return any(request.if_none_match.contains_weak(t) for t in _etag_variants(obj, *state))
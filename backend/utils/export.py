@@ -0,0 +1,62 @@
+import io
+import os
+import zipfile
+from models import Invoice, Receipt, DeliveryNote
+from utils.archive import ARCHIVE_MODELS
+from utils.pdf import invoice_lines, receipt_lines, delivery_note_lines, render_pdf, stream_pdf
+
+# doc type -> (model, page lines, file prefix, roles allowed to export)
+EXPORT_TYPES = {
+    'invoices': (Invoice, invoice_lines, 'invoice', ['Admin', 'Sales']),
+    'receipts': (Receipt, receipt_lines, 'receipt', ['Admin', 'Sales']),
+    'delivery-notes': (DeliveryNote, delivery_note_lines, 'delivery_note', ['Admin', 'Warehouse']),
+}
+
+class _ZipStream:
+    """Write-only, non-seekable sink; zipfile then emits data descriptors."""
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def documents(model, start, end, batch_size=1000):
+    """Live and archived documents created in [start, end), streamed in batches."""
+    for m in (model, ARCHIVE_MODELS[model]):
+        yield from m.query.filter(
+            m.created_at >= start, m.created_at < end
+        ).order_by(m.id).yield_per(batch_size)
+
+def stream_zip(records, lines, prefix):
+    out = _ZipStream()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for record in records:
+            name = f'{prefix}_{record.id}.pdf'
+            if record.pdf_path and os.path.exists(record.pdf_path):
+                zf.write(record.pdf_path, name)
+            else:
+                buf = io.BytesIO()
+                render_pdf(lines(record), buf)
+                zf.writestr(name, buf.getvalue())
+            data = out.drain()
+            if data:
+                yield data
+    yield out.drain()
+
+def stream_merged_pdf(records, lines):
+    # One page per document, each sent as soon as it is written
+    yield from stream_pdf(lines(record) for record in records)
@@ -0,0 +1,72 @@
+import datetime
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from models import Stock, StockMovement, StockForecast
+from app import db
+
+# Movement kinds that count as customer demand
+DEMAND_KINDS = ('delivery',)
+
+def load_demand(stock_ids, start, history_days):
+    """Daily demand per item as (row index, day index, quantity) arrays."""
+    rows = db.session.execute(
+        select(
+            StockMovement.stock_id,
+            func.date(StockMovement.created_at),
+            -func.sum(StockMovement.quantity)
+        ).where(
+            StockMovement.kind.in_(DEMAND_KINDS),
+            StockMovement.created_at >= datetime.datetime.combine(start, datetime.time.min)
+        ).group_by(StockMovement.stock_id, func.date(StockMovement.created_at))
+        .order_by(StockMovement.stock_id)
+    ).all()
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    ids, days, quantities = zip(*rows)
+    ids = np.asarray(ids, dtype=np.int64)
+    row_idx = np.searchsorted(stock_ids, ids)
+    day_idx = (np.asarray(days, dtype='datetime64[D]') - np.datetime64(start, 'D')).astype(np.int64)
+    # Drop movements of items that no longer exist and days outside the window
+    known = stock_ids[np.minimum(row_idx, len(stock_ids) - 1)] == ids if len(stock_ids) else False
+    keep = known & (day_idx >= 0) & (day_idx < history_days)
+    return row_idx[keep], day_idx[keep], np.asarray(quantities, dtype=np.float64)[keep]
+
+def forecast_chunk(demand, method, window, alpha, lead_time_days, service_z):
+    """Vectorized forecast over a (items, days) demand matrix."""
+    if method == 'sma':
+        avg = demand[:, -window:].mean(axis=1)
+    else:
+        # Exponential smoothing as one weighted sum, newest day weighted most
+        weights = alpha * (1 - alpha) ** np.arange(demand.shape[1])[::-1]
+        avg = demand @ (weights / weights.sum())
+    std = demand[:, -window:].std(axis=1)
+    safety = service_z * std * np.sqrt(lead_time_days)
+    return avg, std, safety, avg * lead_time_days + safety
+
+def compute_forecasts(method='ema', history_days=365, window=28, alpha=0.2,
+                      lead_time_days=7, service_z=1.65, chunk_size=10000):
+    if method not in ('ema', 'sma'):
+        raise ValueError(f'Unknown forecast method: {method}')
+    window = min(window, history_days)
+    start = datetime.date.today() - datetime.timedelta(days=history_days - 1)
+    stock_ids = np.asarray(db.session.scalars(select(Stock.id).order_by(Stock.id)).all(), dtype=np.int64)
+    row_idx, day_idx, quantities = load_demand(stock_ids, start, history_days)
+
+    db.session.execute(delete(StockForecast))
+    # Rows are sorted by item, so each chunk of items is a contiguous slice
+    for lo in range(0, len(stock_ids), chunk_size):
+        hi = min(lo + chunk_size, len(stock_ids))
+        a, b = np.searchsorted(row_idx, [lo, hi])
+        demand = np.zeros((hi - lo, history_days))
+        np.add.at(demand, (row_idx[a:b] - lo, day_idx[a:b]), quantities[a:b])
+        avg, std, safety, reorder = forecast_chunk(demand, method, window, alpha, lead_time_days, service_z)
+        db.session.execute(insert(StockForecast), [
+            {'stock_id': stock_id, 'avg_daily_demand': x, 'demand_std': s,
+             'safety_stock': ss, 'reorder_point': rp}
+            for stock_id, x, s, ss, rp in zip(
+                stock_ids[lo:hi].tolist(), avg.tolist(), std.tolist(), safety.tolist(), reorder.tolist()
+            )
+        ])
+    db.session.commit()
+    return len(stock_ids)
@@ -0,0 +1,96 @@
+import datetime
+from sqlalchemy import case, func, insert, or_, select
+from models import Stock, StockMovement, StockSnapshot, ON_HAND_KINDS, RESERVED_KINDS
+from app import db
+
+# Sign applied to the quantity given for each movement kind; adjustments are
+# passed already signed.
+MOVEMENT_SIGNS = {
+    'receipt': 1,
+    'delivery': -1,
+    'adjustment': 1,
+    'reservation': 1,
+    'release': -1,
+}
+
+# Reserve goods when an order is taken, then on dispatch record a release and a
+# delivery for the same quantity (or just a release if the order is cancelled).
+# ON_HAND_KINDS and RESERVED_KINDS live with the models, which read the current
+# levels from the ledger.
+
+# Snapshots only fold movements older than this, so a transaction that was
+# still open when the snapshot ran is not left out of it for good.
+SNAPSHOT_SETTLE = datetime.timedelta(minutes=5)
+
+def record_movement(stock_id, kind, quantity, reference=None):
+    """Append a movement; the stock row itself is never written."""
+    if kind not in MOVEMENT_SIGNS:
+        raise ValueError(f'Unknown movement kind: {kind}')
+    if kind != 'adjustment' and quantity <= 0:
+        raise ValueError('Quantity must be positive')
+    # Best effort only: without a lock a concurrent release can still slip in
+    if kind == 'release' and db.session.scalar(select(Stock.reserved).where(Stock.id == stock_id)) < quantity:
+        raise ValueError('Cannot release more than is reserved')
+    movement = StockMovement(stock_id=stock_id, kind=kind, quantity=MOVEMENT_SIGNS[kind] * quantity, reference=reference)
+    db.session.add(movement)
+    return movement
+
+def _latest_snapshot(stock_id, at):
+    return StockSnapshot.query.filter(
+        StockSnapshot.stock_id == stock_id,
+        StockSnapshot.taken_at <= at
+    ).order_by(StockSnapshot.taken_at.desc(), StockSnapshot.id.desc()).first()
+
+def quantity_at(stock_id, at):
+    """Quantity on hand at `at`: nearest earlier snapshot plus the movements after it."""
+    snapshot = _latest_snapshot(stock_id, at)
+    query = db.session.query(func.coalesce(func.sum(StockMovement.quantity), 0)).filter(
+        StockMovement.stock_id == stock_id,
+        StockMovement.kind.in_(ON_HAND_KINDS),
+        StockMovement.created_at <= at
+    )
+    if snapshot:
+        query = query.filter(StockMovement.created_at > snapshot.taken_at)
+    return (snapshot.quantity if snapshot else 0) + query.scalar()
+
+def movements_between(stock_id, start, end):
+    return StockMovement.query.filter(
+        StockMovement.stock_id == stock_id,
+        StockMovement.created_at > start,
+        StockMovement.created_at <= end
+    ).order_by(StockMovement.created_at, StockMovement.id).all()
+
+def take_snapshots():
+    """Write a snapshot for every item with settled movements since its latest snapshot."""
+    cutoff = datetime.datetime.utcnow() - SNAPSHOT_SETTLE
+    latest = select(
+        StockSnapshot.stock_id, func.max(StockSnapshot.id).label('id')
+    ).group_by(StockSnapshot.stock_id).subquery()
+    base = select(
+        StockSnapshot.stock_id, StockSnapshot.quantity, StockSnapshot.reserved, StockSnapshot.taken_at
+    ).join(latest, StockSnapshot.id == latest.c.id).subquery()
+
+    def folded(column, kinds):
+        return func.coalesce(func.max(column), 0) + func.sum(
+            case((StockMovement.kind.in_(kinds), StockMovement.quantity), else_=0)
+        )
+
+    rows = db.session.execute(
+        select(
+            StockMovement.stock_id,
+            folded(base.c.quantity, ON_HAND_KINDS),
+            folded(base.c.reserved, RESERVED_KINDS)
+        ).outerjoin(base, base.c.stock_id == StockMovement.stock_id)
+        .where(
+            StockMovement.created_at <= cutoff,
+            or_(base.c.taken_at.is_(None), StockMovement.created_at > base.c.taken_at)
+        )
+        .group_by(StockMovement.stock_id)
+    ).all()
+    if rows:
+        db.session.execute(insert(StockSnapshot), [
+            {'stock_id': stock_id, 'quantity': quantity, 'reserved': reserved, 'taken_at': cutoff}
+            for stock_id, quantity, reserved in rows
+        ])
+    db.session.commit()
+    return len(rows)
@@ -0,0 +1,43 @@
+import datetime
+import importlib
+import json
+from models import Notification
+from app import db
+
+class ConsoleSender:
+    def send(self, notification):
+        print(f'[{notification.kind}] {notification.payload}')
+
+class FileSender:
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, notification):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({
+                'id': notification.id,
+                'kind': notification.kind,
+                'payload': json.loads(notification.payload)
+            }) + '\n')
+
+def get_sender(config):
+    """NOTIFY_SENDER is 'console', 'file' or a 'module:Class' import path."""
+    name = config.get('NOTIFY_SENDER', 'console')
+    if name == 'console':
+        return ConsoleSender()
+    if name == 'file':
+        return FileSender(config.get('NOTIFY_FILE', 'notifications.log'))
+    module, _, cls = name.partition(':')
+    return getattr(importlib.import_module(module), cls)()
+
+def dispatch_notifications(sender, batch_size=100):
+    sent = 0
+    while True:
+        batch = Notification.query.filter(Notification.sent_at.is_(None)).order_by(Notification.id).limit(batch_size).all()
+        if not batch:
+            return sent
+        for notification in batch:
+            sender.send(notification)
+            notification.sent_at = datetime.datetime.utcnow()
+        db.session.commit()
+        sent += len(batch)
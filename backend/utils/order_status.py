@@ -0,0 +1,55 @@
+from sqlalchemy import insert, select, update
+from models import Order, DeliveryNote
+from app import db
+
+# pending -> confirmed -> shipped -> delivered, with cancellation until delivery
+ORDER_TRANSITIONS = {
+    'pending': ('confirmed', 'cancelled'),
+    'confirmed': ('shipped', 'cancelled'),
+    'shipped': ('delivered', 'cancelled'),
+    'delivered': (),
+    'cancelled': (),
+}
+
+CLOSED_ORDER_STATUSES = ('delivered', 'cancelled')
+
+def can_transition(current, target):
+    return target in ORDER_TRANSITIONS.get(current, ())
+
+def allowed_sources(target):
+    if target not in ORDER_TRANSITIONS:
+        raise ValueError(f'Unknown order status: {target}')
+    return [status for status, targets in ORDER_TRANSITIONS.items() if target in targets]
+
+def _transition_statement(target):
+    return update(Order).where(
+        Order.status.in_(allowed_sources(target))
+    ).values(status=target, version=Order.version + 1).returning(Order.id).execution_options(
+        synchronize_session=False
+    )
+
+def transition_orders(target, ids=None, conditions=(), chunk_size=500):
+    """Apply a status transition set-wise; returns (updated ids, rejected ids).
+
+    Either `ids` or filter `conditions` select the orders. Orders whose current
+    status does not allow the transition are left untouched and reported as
+    rejected.
+    """
+    statement = _transition_statement(target)
+    if ids is None:
+        ids = db.session.scalars(select(Order.id).where(*conditions).order_by(Order.id)).all()
+    updated = []
+    for lo in range(0, len(ids), chunk_size):
+        updated += db.session.scalars(statement.where(*conditions, Order.id.in_(ids[lo:lo + chunk_size]))).all()
+    done = set(updated)
+    return updated, [i for i in dict.fromkeys(ids) if i not in done]
+
+def create_delivery_notes(order_ids):
+    """Insert one delivery note per order, without rendering their PDFs."""
+    if not order_ids:
+        return []
+    rows = db.session.execute(
+        insert(DeliveryNote).returning(DeliveryNote.id, DeliveryNote.order_id),
+        [{'order_id': order_id} for order_id in order_ids]
+    ).all()
+    return [{'id': note_id, 'order_id': order_id} for note_id, order_id in rows]
@@ -0,0 +1,79 @@
+import datetime
+import json
+from sqlalchemy import and_, case, insert, or_, select, update
+from models import Invoice, Order, Payment, JobState, Notification
+from app import db
+from utils.balances import paid_amount
+
+JOB_NAME = 'overdue-invoices'
+# Re-examine a little before the watermark to absorb clock skew and coarse
+# timestamps; the job is idempotent so the overlap is harmless.
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+
+def _past_due(now, terms):
+    return or_(
+        Invoice.due_date < now,
+        and_(Invoice.due_date.is_(None), Invoice.created_at < now - terms)
+    )
+
+def _changed_since(since, now, terms):
+    """Invoices that may have changed overdue state between `since` and `now`."""
+    return or_(
+        Invoice.created_at > since,
+        Invoice.updated_at > since,
+        Invoice.due_date.between(since, now),
+        and_(Invoice.due_date.is_(None), Invoice.created_at.between(since - terms, now - terms)),
+        Invoice.id.in_(select(Payment.invoice_id).where(Payment.updated_at > since))
+    )
+
+def _update_flags(ids, value, chunk_size):
+    for lo in range(0, len(ids), chunk_size):
+        # Keep updated_at as is so the job does not re-examine its own writes
+        db.session.execute(
+            update(Invoice).where(Invoice.id.in_(ids[lo:lo + chunk_size]))
+            .values(is_overdue=value, updated_at=Invoice.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+def detect_overdue(terms_days=30, chunk_size=500):
+    """Flag unpaid invoices past due, clear settled ones and queue reminders.
+
+    Only invoices touched since the previous run's watermark are examined.
+    Returns (newly overdue, cleared) counts.
+    """
+    state = db.session.get(JobState, JOB_NAME) or JobState(name=JOB_NAME)
+    now = datetime.datetime.utcnow()
+    terms = datetime.timedelta(days=terms_days)
+    since = state.watermark - WATERMARK_OVERLAP if state.watermark else datetime.datetime(1970, 1, 1)
+    # Balances are summed only for the invoices the watermark lets through
+    outstanding = Invoice.total_amount - paid_amount(Invoice.id)
+    rows = db.session.execute(
+        select(
+            Invoice.id, Invoice.order_id, Order.customer_name, Invoice.is_overdue,
+            outstanding, case((_past_due(now, terms), True), else_=False)
+        ).outerjoin(Order, Order.id == Invoice.order_id)
+        .where(_changed_since(since, now, terms))
+    ).all()
+
+    newly_overdue, cleared = [], []
+    for invoice_id, order_id, customer_name, flagged, balance, past_due in rows:
+        overdue = bool(past_due) and balance > 0
+        if overdue and not flagged:
+            newly_overdue.append((invoice_id, order_id, customer_name, balance))
+        elif flagged and not overdue:
+            cleared.append(invoice_id)
+
+    _update_flags([r[0] for r in newly_overdue], True, chunk_size)
+    _update_flags(cleared, False, chunk_size)
+    if newly_overdue:
+        db.session.execute(insert(Notification), [
+            {'kind': 'invoice_overdue', 'payload': json.dumps({
+                'invoice_id': invoice_id, 'order_id': order_id,
+                'customer_name': customer_name, 'outstanding': balance
+            })}
+            for invoice_id, order_id, customer_name, balance in newly_overdue
+        ])
+    state.watermark = now
+    db.session.add(state)
+    db.session.commit()
+    return len(newly_overdue), len(cleared)
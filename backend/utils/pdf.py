@@ -2,30 +2,88 @@ from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 import os
 
-def generate_invoice_pdf(invoice):
-    filename = f'invoice_{invoice.id}.pdf'
-    filepath = os.path.join('pdfs', filename)
-    c = canvas.Canvas(filepath, pagesize=letter)
-    c.drawString(100, 750, f"Invoice ID: {invoice.id}")
-    c.drawString(100, 730, f"Order ID: {invoice.order_id}")
-    c.drawString(100, 710, f"Total Amount: {invoice.total_amount}")
+def invoice_lines(invoice):
+    return [f"Invoice ID: {invoice.id}", f"Order ID: {invoice.order_id}", f"Total Amount: {invoice.total_amount}"]
+
+def receipt_lines(receipt):
+    return [f"Receipt ID: {receipt.id}", f"Payment ID: {receipt.payment_id}"]
+
+def delivery_note_lines(note):
+    return [f"Delivery Note ID: {note.id}", f"Order ID: {note.order_id}"]
+
+def draw_page(c, lines):
+    for i, line in enumerate(lines):
+        c.drawString(100, 750 - 20 * i, line)
+
+def _pdf_text(line):
+    text = str(line).encode('latin-1', 'replace')
+    return text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+def stream_pdf(pages):
+    """Yield a multi-page PDF piece by piece, one page per list of lines.
+
+    Uses the same layout as draw_page (Helvetica 12 on letter paper) but writes
+    the file by hand so each page can be sent as soon as it is built; only the
+    object offsets are kept until the cross-reference table at the end.
+    """
+    offsets = {}
+    position = 0
+    page_refs = []
+
+    def emit(number, body):
+        nonlocal position
+        data = b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        offsets[number] = position
+        position += len(data)
+        return data
+
+    def chunk(data):
+        nonlocal position
+        position += len(data)
+        return data
+
+    # 1: catalog, 2: page tree (written last, once every page is known), 3: font
+    yield chunk(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    yield emit(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+    yield emit(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+    number = 4
+    for lines in pages:
+        content = b'\n'.join(
+            b'BT /F1 12 Tf 100 %d Td (%s) Tj ET' % (750 - 20 * i, _pdf_text(line))
+            for i, line in enumerate(lines)
+        )
+        yield emit(number, b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        yield emit(number + 1, (
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % number
+        ))
+        page_refs.append(b'%d 0 R' % (number + 1))
+        number += 2
+    yield emit(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(page_refs), len(page_refs)))
+
+    xref = position
+    table = [b'xref\n0 %d\n' % number, b'0000000000 65535 f \n']
+    table.extend(b'%010d 00000 n \n' % offsets[n] for n in range(1, number))
+    table.append(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (number, xref))
+    yield b''.join(table)
+
+def render_pdf(lines, target):
+    # target is a file path or a writable file object
+    c = canvas.Canvas(target, pagesize=letter)
+    draw_page(c, lines)
     c.save()
+
+def generate_invoice_pdf(invoice):
+    filepath = os.path.join('pdfs', f'invoice_{invoice.id}.pdf')
+    render_pdf(invoice_lines(invoice), filepath)
     return filepath
 
 def generate_receipt_pdf(receipt):
-    filename = f'receipt_{receipt.id}.pdf'
-    filepath = os.path.join('pdfs', filename)
-    c = canvas.Canvas(filepath, pagesize=letter)
-    c.drawString(100, 750, f"Receipt ID: {receipt.id}")
-    c.drawString(100, 730, f"Payment ID: {receipt.payment_id}")
-    c.save()
+    filepath = os.path.join('pdfs', f'receipt_{receipt.id}.pdf')
+    render_pdf(receipt_lines(receipt), filepath)
     return filepath
 
 def generate_delivery_note_pdf(note):
-    filename = f'delivery_note_{note.id}.pdf'
-    filepath = os.path.join('pdfs', filename)
-    c = canvas.Canvas(filepath, pagesize=letter)
-    c.drawString(100, 750, f"Delivery Note ID: {note.id}")
-    c.drawString(100, 730, f"Order ID: {note.order_id}")
-    c.save()
+    filepath = os.path.join('pdfs', f'delivery_note_{note.id}.pdf')
+    render_pdf(delivery_note_lines(note), filepath)
     return filepath
@@ -0,0 +1,17 @@
+from flask import make_response
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+def output_msgpack(data, code, headers=None):
+    resp = make_response(msgpack.packb(data, use_bin_type=True), code)
+    resp.headers.extend(headers or {})
+    return resp
+
+def register_representations(api):
+    # JSON stays the default; MessagePack is served only when asked for
+    if msgpack is not None:
+        api.representation('application/msgpack')(output_msgpack)
+        api.representation('application/x-msgpack')(output_msgpack)
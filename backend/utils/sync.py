@@ -0,0 +1,79 @@
+import base64
+import datetime
+import json
+from sqlalchemy import and_, func, insert, literal, or_, select, union_all
+from models import DeletionLog
+from app import db
+
+def log_deletion(model, row_id):
+    db.session.add(DeletionLog(table_name=model.__tablename__, row_id=row_id))
+
+def log_deletions(model, condition):
+    """Set-based tombstones for every row of `model` matching `condition`."""
+    db.session.execute(insert(DeletionLog).from_select(
+        ['table_name', 'row_id'], select(literal(model.__tablename__), model.id).where(condition)
+    ))
+
+def encode_watermark(changed_at, row_id, tombstone_id):
+    state = [changed_at.isoformat() if changed_at else None, row_id, tombstone_id]
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+def decode_watermark(token):
+    changed_at, row_id, tombstone_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return (datetime.datetime.fromisoformat(changed_at) if changed_at else None), row_id, tombstone_id
+
+def changes_since(model, sources, watermark=None, limit=1000, settle_seconds=2):
+    """One page of rows and tombstones after `watermark`, plus the next watermark.
+
+    `sources` lists (row id, change time) column pairs; a row's change time is
+    the latest over all of them, so changes kept in other tables (such as stock
+    movements) count too. Rows are paged by (change time, id) and tombstones by
+    id. Rows changed and tombstones written in the last `settle_seconds` are
+    held back so transactions still committing with an earlier timestamp or id
+    are not skipped.
+    """
+    settled = datetime.datetime.utcnow() - datetime.timedelta(seconds=settle_seconds)
+    tombstone_filter = [DeletionLog.table_name == model.__tablename__, DeletionLog.deleted_at < settled]
+    if watermark:
+        changed_at, row_id, tombstone_id = decode_watermark(watermark)
+    else:
+        # A fresh client takes a full copy and needs no past tombstones
+        changed_at, row_id = None, 0
+        tombstone_id = db.session.scalar(
+            select(func.coalesce(func.max(DeletionLog.id), 0)).where(*tombstone_filter)
+        )
+
+    # Each source only reads entries from the watermark on, through its index
+    feeds = []
+    for id_column, time_column in sources:
+        feed = select(id_column.label('id'), time_column.label('changed_at'))
+        feeds.append(feed.where(time_column >= changed_at) if changed_at else feed)
+    if len(feeds) == 1:
+        changes = feeds[0].subquery()
+    else:
+        merged = union_all(*feeds).subquery()
+        changes = select(
+            merged.c.id, func.max(merged.c.changed_at).label('changed_at')
+        ).group_by(merged.c.id).subquery()
+
+    query = db.session.query(model, changes.c.changed_at).join(changes, changes.c.id == model.id).filter(
+        changes.c.changed_at < settled
+    )
+    if changed_at:
+        query = query.filter(or_(
+            changes.c.changed_at > changed_at,
+            and_(changes.c.changed_at == changed_at, model.id > row_id)
+        ))
+    rows = query.order_by(changes.c.changed_at, model.id).limit(limit + 1).all()
+    tombstones = db.session.execute(
+        select(DeletionLog.id, DeletionLog.row_id).where(*tombstone_filter, DeletionLog.id > tombstone_id)
+        .order_by(DeletionLog.id).limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        changed_at, row_id = rows[-1][1], rows[-1][0].id
+    if tombstones:
+        tombstone_id = tombstones[-1][0]
+    return [r for r, _ in rows], [r for _, r in tombstones], encode_watermark(changed_at, row_id, tombstone_id), has_more